@@ -53,10 +53,10 @@ class LevyCCurve:
 
     def plot(self, show=True, figsize=(6, 6), title=None, linewidth=0.8):
         """Plot generated points."""
-        if not self.points:
+        if len(self.points) == 0:
             self.generate()
 
-        xs, ys = zip(*self.points)
+        xs, ys = self.points[:, 0], self.points[:, 1]
         plt.figure(figsize=figsize)
         if self.method == "ifs":
             plt.scatter(xs, ys, s=linewidth/4)
@@ -99,72 +99,55 @@ class LevyCCurve:
         if step is None:
             step = 1.0 / (2 ** (self.iterations / 2))
 
-        x, y = 0.0, 0.0
-        heading = 0.0
         angle = math.radians(self.angle_deg)
-        points = [(x, y)]
-
-        for ch in instructions:
-            if ch == "F":
-                x += step * math.cos(heading)
-                y += step * math.sin(heading)
-                points.append((x, y))
-            elif ch == "+":
-                heading -= angle
-            elif ch == "-":
-                heading += angle
+        codes = np.frombuffer(instructions.encode("ascii"), dtype=np.uint8)
 
+        # heading before every "F" = cumulative sum of turns; positions = cumulative steps
+        turn = np.zeros(codes.size, dtype=np.int64)
+        turn[codes == ord("+")] = -1
+        turn[codes == ord("-")] = 1
+        headings = angle * np.cumsum(turn)[codes == ord("F")]
+
+        points = np.zeros((headings.size + 1, 2), dtype=float)
+        points[1:, 0] = np.cumsum(step * np.cos(headings))
+        points[1:, 1] = np.cumsum(step * np.sin(headings))
         return points
 
     # ---- IFS version ----
     def _generate_ifs_points(self, discard=50):
         """Generate points using Iterated Function System (IFS) for Lévy C-curve."""
-        rng = np.random.default_rng(123)
-        x = np.array([0.0, 0.0], dtype=float)
+        return self._chaos_game(np.pi / 4, discard)
 
-        theta = np.pi / 4 
-        scale = 1 / np.sqrt(2)
-        R1 = scale * np.array([[np.cos(theta), -np.sin(theta)],
-                            [np.sin(theta),  np.cos(theta)]])
-        R2 = scale * np.array([[np.cos(-theta), -np.sin(-theta)],
-                            [np.sin(-theta),  np.cos(-theta)]])
-        b1 = np.array([0, 0])
-        b2 = np.array([0.5, 0.5])
-
-        transforms = [(R1, b1), (R2, b2)]
-        probs = [0.5, 0.5]
-
-        points = []
-        for i in range(self.n_points + discard):
-            k = rng.choice(len(transforms), p=probs)
-            x = transforms[k][0] @ x + transforms[k][1]
-            if i >= discard:
-                points.append(x.copy())
-
-        return points
-    
     def _generate_ifs_modified(self, discard=50):
         """Generate points using Iterated Function System (IFS) for Lévy C-curve."""
+        return self._chaos_game(np.pi / 6, discard)
+
+    def _chaos_game(self, theta, discard, n_traj=1024):
+        """
+        Chaos game for the two maps scale*R(+theta) and scale*R(-theta) + (0.5, 0.5).
+
+        Runs `n_traj` independent trajectories side by side, each started from a
+        random point and warmed up for `discard` steps.
+        """
         rng = np.random.default_rng(123)
-        x = np.array([0.0, 0.0], dtype=float)
 
-        theta = np.pi / 6
         scale = 1 / np.sqrt(2)
-        R1 = scale * np.array([[np.cos(theta), -np.sin(theta)],
-                            [np.sin(theta),  np.cos(theta)]])
-        R2 = scale * np.array([[np.cos(-theta), -np.sin(-theta)],
-                            [np.sin(-theta),  np.cos(-theta)]])
-        b1 = np.array([0, 0])
-        b2 = np.array([0.5, 0.5])
-
-        transforms = [(R1, b1), (R2, b2)]
-        probs = [0.5, 0.5]
-
-        points = []
-        for i in range(self.n_points + discard):
-            k = rng.choice(len(transforms), p=probs)
-            x = transforms[k][0] @ x + transforms[k][1]
-            if i >= discard:
-                points.append(x.copy())
-
-        return points
+        c, s = scale * math.cos(theta), scale * math.sin(theta)
+        As = np.array([[[c, -s], [s, c]], [[c, s], [-s, c]]])  # (k, 2, 2)
+        bs = np.array([[0.0, 0.0], [0.5, 0.5]])  # (k, 2)
+
+        b = max(1, n_traj)
+        steps = -(-self.n_points // b)  # ceil
+        X = rng.standard_normal((b, 2))
+        points = np.empty((steps, b, 2), dtype=float)
+        scratch = np.empty((2, b, 2), dtype=float)  # buffers for the warm-up steps
+
+        for t in range(discard + steps):
+            ks = rng.integers(0, len(As), size=b)
+            # write the new state straight into its output row, no per-step copy
+            Y = points[t - discard] if t >= discard else scratch[t % 2]
+            np.einsum("bij,bj->bi", As[ks], X, out=Y)
+            Y += bs[ks]
+            X = Y
+
+        return points.reshape(-1, 2)[: self.n_points]
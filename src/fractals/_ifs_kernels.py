@@ -0,0 +1,72 @@
+"""Kernele Numba dla gry w chaos (opcjonalne - wymagaja pakietu numba)."""
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, prange
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_INV_2_53 = 1.0 / 9007199254740992.0
+
+
+@njit(inline="always")
+def _splitmix64(state):
+    """Jeden krok splitmix64: zwraca (nowy stan, liczba w [0, 1))."""
+    state = state + _GOLDEN
+    z = state
+    z = (z ^ (z >> np.uint64(30))) * _MIX1
+    z = (z ^ (z >> np.uint64(27))) * _MIX2
+    z = z ^ (z >> np.uint64(31))
+    return state, (z >> np.uint64(11)) * _INV_2_53
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def chaos_game(As, bs, cum_probs, seeds, x0, n_points, discard, b_traj):
+    """Gra w chaos dla b_traj trajektorii; punkt kroku s trajektorii t trafia do wiersza s*b_traj+t.
+
+    Kazda trajektoria startuje z x0[t] i ma wlasny generator splitmix64 zainicjowany z seeds[t].
+    """
+    k = As.shape[0]
+    steps = (n_points + b_traj - 1) // b_traj
+    out = np.empty((n_points, 2), dtype=As.dtype)
+    for t in prange(b_traj):
+        state = np.uint64(seeds[t])
+        x0n = x0[t, 0]
+        x1n = x0[t, 1]
+        for i in range(discard + steps):
+            state, u = _splitmix64(state)
+            j = 0
+            while j < k - 1 and u >= cum_probs[j]:
+                j += 1
+            x0o = x0n
+            x0n = As[j, 0, 0] * x0o + As[j, 0, 1] * x1n + bs[j, 0]
+            x1n = As[j, 1, 0] * x0o + As[j, 1, 1] * x1n + bs[j, 1]
+            if i >= discard:
+                row = (i - discard) * b_traj + t
+                if row < n_points:
+                    out[row, 0] = x0n
+                    out[row, 1] = x1n
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def levy_two_maps(c, s, seed, n_points, discard, out):
+    """Gra w chaos dla dwoch map krzywej Levy'ego z wpisanymi na stale wspolczynnikami.
+
+    Mapa 1: [[c, -s], [s, c]] @ p, mapa 2: [[c, s], [-s, c]] @ p + (0.5, 0.5),
+    kazda z prawd. 1/2; wynik trafia do out o ksztalcie (n_points, 2).
+    """
+    state = np.uint64(seed)
+    x = 0.0
+    y = 0.0
+    for i in range(discard + n_points):
+        state, u = _splitmix64(state)
+        if u < 0.5:
+            x, y = c * x - s * y, s * x + c * y
+        else:
+            x, y = c * x + s * y + 0.5, -s * x + c * y + 0.5
+        if i >= discard:
+            out[i - discard, 0] = x
+            out[i - discard, 1] = y
+    return out
@@ -0,0 +1,35 @@
+"""Kernele Numba dla rozwijania L-systemow (opcjonalne - wymagaja pakietu numba)."""
+from __future__ import annotations
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def expand_stochastic(buf, rand_bits, ra, rb, f_ord):
+    """Jeden krok rozwiniecia: i-te 'F' w buf -> rb, gdy rand_bits[i], inaczej ra.
+
+    Pierwszy przebieg liczy dlugosc wyniku, drugi kopiuje bajty do gotowego bufora.
+    """
+    n_out = 0
+    j = 0
+    for c in buf:
+        if c == f_ord:
+            n_out += rb.size if rand_bits[j] else ra.size
+            j += 1
+        else:
+            n_out += 1
+
+    out = np.empty(n_out, dtype=np.uint8)
+    pos = 0
+    j = 0
+    for c in buf:
+        if c == f_ord:
+            rule = rb if rand_bits[j] else ra
+            out[pos : pos + rule.size] = rule
+            pos += rule.size
+            j += 1
+        else:
+            out[pos] = c
+            pos += 1
+    return out
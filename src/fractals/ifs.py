@@ -3,6 +3,11 @@ import numpy as np
 from dataclasses import dataclass
 from .utils import normalize_probs, seeded_rng
 
+try:
+    from ._ifs_kernels import chaos_game as _chaos_game_jit
+except ImportError:  # numba jest opcjonalna - zostaje sciezka NumPy
+    _chaos_game_jit = None
+
 
 @dataclass
 class Affine2D:
@@ -10,12 +15,58 @@ class Affine2D:
     b: np.ndarray  # wektor (2,)
 
 
+def _build_alias(probs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Tablice metody aliasow Walkera dla rozkladu dyskretnego."""
+    k = len(probs)
+    prob_table = np.asarray(probs, dtype=float) * k
+    alias_table = np.arange(k)
+    small = [i for i in range(k) if prob_table[i] < 1.0]
+    large = [i for i in range(k) if prob_table[i] >= 1.0]
+    while small and large:
+        lo, hi = small.pop(), large.pop()
+        alias_table[lo] = hi
+        prob_table[hi] -= 1.0 - prob_table[lo]
+        (small if prob_table[hi] < 1.0 else large).append(hi)
+    for i in small + large:  # resztki po bledach zaokraglen
+        prob_table[i] = 1.0
+    return prob_table, alias_table
+
+
 class IFS:
     """IFS 2D z probkowaniem"""
 
     def __init__(self, transforms: list[Affine2D], probs: list[float] | None = None):
         self.transforms = transforms
         self.probs = normalize_probs(probs if probs is not None else [1] * len(transforms))
+        # uklad SoA: wszystkie macierze i przesuniecia w jednej tablicy
+        self._As = np.stack([np.asarray(t.A, dtype=np.float64) for t in transforms])  # (k, 2, 2)
+        self._bs = np.stack([np.asarray(t.b, dtype=np.float64) for t in transforms])  # (k, 2)
+        self._cum_probs = np.cumsum(self.probs)
+        self._uniform = bool(np.allclose(self.probs, self.probs[0]))
+        if not self._uniform:
+            self._prob_table, self._alias_table = _build_alias(self.probs)
+
+    def _draw_indices(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """Wylosuj n indeksow transformacji zgodnie z self.probs."""
+        k = len(self.transforms)
+        if self._uniform:
+            return rng.integers(0, k, size=n)
+        u = rng.random(n)
+        j = rng.integers(0, k, size=n)
+        return np.where(u < self._prob_table[j], j, self._alias_table[j])
+
+    def _sample_jit(
+        self, rng: np.random.Generator, n_points: int, discard: int, x0, b_traj: int, dtype
+    ) -> np.ndarray:
+        """Gra w chaos skompilowana przez Numba (osobny generator na trajektorie).
+
+        x0: punkt startowy (2,) wspolny dla trajektorii lub starty (b_traj, 2).
+        """
+        As = self._As.astype(dtype, copy=False)
+        bs = self._bs.astype(dtype, copy=False)
+        seeds = rng.integers(0, 2**63, size=b_traj, dtype=np.uint64)
+        x0 = np.broadcast_to(np.asarray(x0, dtype=dtype), (b_traj, 2))
+        return _chaos_game_jit(As, bs, self._cum_probs, seeds, x0, n_points, discard, b_traj)
 
     def sample(
         self,
@@ -23,15 +74,71 @@ class IFS:
         discard: int = 100,
         seed: int | None = 1337,
         x0: np.ndarray | None = None,
-    ) -> list[tuple[float, float]]:
+        dtype: np.dtype = np.float32,
+    ) -> np.ndarray:
+        """Gra w chaos; zwraca tablice punktow o ksztalcie (n_points, 2) i typie dtype.
+
+        Gdy numba jest dostepna, petla jest kompilowana (inny strumien losowy niz NumPy).
+        """
         rng = seeded_rng(seed)  # losowe wybory transformacji
-        x = np.array([0.0, 0.0], dtype=float) if x0 is None else np.asarray(x0, dtype=float)
-        pts: list[tuple[float, float]] = []
+        if _chaos_game_jit is not None:
+            start = np.zeros(2) if x0 is None else x0
+            return self._sample_jit(rng, n_points, discard, start, b_traj=1, dtype=dtype)
+
+        As, bs = self._As, self._bs
+
+        # wszystkie indeksy transformacji losowane z gory
+        ks = self._draw_indices(rng, n_points + discard)
+
+        # wspolczynniki jako listy floatow - skalarna petla bez narzutu ndarray
+        a00, a01 = As[:, 0, 0].tolist(), As[:, 0, 1].tolist()
+        a10, a11 = As[:, 1, 0].tolist(), As[:, 1, 1].tolist()
+        b0, b1 = bs[:, 0].tolist(), bs[:, 1].tolist()
 
-        for i in range(n_points + discard):  # zbieranie punktow
-            k = rng.choice(len(self.transforms), p=self.probs)
-            T = self.transforms[k]
-            x = T.A @ x + T.b
+        x = np.zeros(2) if x0 is None else np.asarray(x0, dtype=float)
+        ax, ay = float(x[0]), float(x[1])
+        out = np.empty((n_points, 2), dtype=dtype)
+
+        for i, j in enumerate(ks.tolist()):  # zbieranie punktow
+            ax, ay = a00[j] * ax + a01[j] * ay + b0[j], a10[j] * ax + a11[j] * ay + b1[j]
             if i >= discard:
-                pts.append((float(x[0]), float(x[1])))
-        return pts
+                out[i - discard] = (ax, ay)
+        return out
+
+    def sample_batched(
+        self,
+        n_points: int = 50_000,
+        n_traj: int = 1024,
+        warmup: int = 32,
+        seed: int | None = 1337,
+        dtype: np.dtype = np.float32,
+    ) -> np.ndarray:
+        """Gra w chaos dla n_traj niezaleznych trajektorii prowadzonych rownolegle.
+
+        Kazda trajektoria startuje z losowego punktu i pomija `warmup` krokow.
+        Punkty sa ulozone krok po kroku, wiec prefiks wyniku zalezy tylko od seeda.
+        Gdy numba jest dostepna, trajektorie licza sie rownolegle w skompilowanym kernelu.
+        """
+        rng = seeded_rng(seed)
+        if _chaos_game_jit is not None:
+            b = max(1, n_traj)
+            x0 = rng.standard_normal((b, 2))  # losowe starty, jak w sciezce NumPy
+            return self._sample_jit(rng, n_points, warmup, x0, b_traj=b, dtype=dtype)
+
+        As = self._As.astype(dtype, copy=False)
+        bs = self._bs.astype(dtype, copy=False)
+
+        b = max(1, n_traj)
+        steps = -(-n_points // b)  # ceil
+        X = rng.standard_normal((b, 2)).astype(dtype)  # stan wszystkich trajektorii
+        out = np.empty((steps, b, 2), dtype=dtype)
+        scratch = np.empty((2, b, 2), dtype=dtype)  # bufory na kroki rozgrzewki
+
+        for t in range(warmup + steps):
+            ks = self._draw_indices(rng, b)
+            # nowy stan zapisywany od razu w wierszu wyniku, bez kopii X
+            Y = out[t - warmup] if t >= warmup else scratch[t % 2]
+            np.einsum("bij,bj->bi", As[ks], X, out=Y)
+            Y += bs[ks]
+            X = Y
+        return out.reshape(-1, 2)[:n_points]
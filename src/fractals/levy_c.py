@@ -1,9 +1,29 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from collections.abc import Iterator
+import itertools
+import math
+import weakref
 import numpy as np
-from .lsystem import LSystem, LSystemSpec
+from .lsystem import LSystem, LSystemSpec, _expand_bytes
 from .ifs import IFS, Affine2D
-from .utils import rot2d
+from .utils import _INV_SQRT2, rot2d
+
+# krzywe z _generate_lsystem_closed_form trzymane tylko dopoki ktos ich uzywa
+_closed_form_cache: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+def _levy_doublings(angle_deg: float) -> Iterator[np.ndarray]:
+    """Kolejne iteracje krzywej F -> +F--F+ (krok 1), kazda z dwoch kopii poprzedniej."""
+    theta = np.deg2rad(angle_deg)
+    R_plus = rot2d(-theta)  # '+' obraca w prawo
+    R_minus = rot2d(+theta)
+    pts = np.array([[0.0, 0.0], [1.0, 0.0]])
+    while True:
+        yield pts
+        left = pts @ R_plus.T
+        right = pts[1:] @ R_minus.T + left[-1]
+        pts = np.concatenate([left, right])
 
 
 @dataclass
@@ -17,22 +37,29 @@ class LevyCCurve:
         angle_deg: Kat obrotu dla L-systemu.
         lsystem_rules: Slownik regul L-systemu (domyslnie {'F': '+F--F+'}).
         n_points: Liczba punktow dla metody IFS.
+        dtype: Typ wspolrzednych zwracanych punktow (domyslnie float32).
+        seed: Ziarno losowania dla metody IFS; przy stalym ziarnie krotsza probka
+            jest prefiksem dluzszej.
 
     Returns:
-        Dla `generate()`: lista punktów (x, y) opisujaca krzywa/fraktal.
+        Dla `generate()`: punkty (x, y) opisujace krzywa/fraktal. Dla metody "lsystem"
+        tablica jest wspoldzielona miedzy wywolaniami i tylko do odczytu.
     """
     method: str = "lsystem"  # "lsystem" | "ifs"
     iterations: int = 12
     angle_deg: float = 45.0
     lsystem_rules: dict[str, str] | None = None
     n_points: int = 50_000
+    dtype: type = np.float32
+    seed: int | None = 1337
 
-    def generate(self) -> list[tuple[float, float]]:
+    def generate(self) -> np.ndarray:
         """
         Wygeneruj punkty fraktala zgodnie z wybrana metodą.
 
         Returns:
-            Lista krotek (x, y).
+            Tablica punktow (x, y) o ksztalcie (N, 2). Dla metody "lsystem" wynik jest
+            wspoldzielony (cache) i tylko do odczytu - przed zmiana w miejscu uzyj .copy().
         """
         m = self.method.lower()
         if m == "lsystem":
@@ -43,31 +70,83 @@ class LevyCCurve:
             raise ValueError("Unknown method: %r" % self.method)
 
     # L-system
-    def _generate_lsystem(self) -> list[tuple[float, float]]:
+    def _generate_lsystem(self) -> np.ndarray:
         """
         Zbuduj L-system i zinterpretuj go jako krzywa.
 
         Returns:
-            Lista punktow (x, y).
+            Tablica punktow (x, y) o ksztalcie (N, 2).
         """
         rules = self.lsystem_rules or {"F": "+F--F+"}
+        if rules == {"F": "+F--F+"}:
+            return self._generate_lsystem_closed_form()
         spec = LSystemSpec(axiom="F", rules=rules, angle_deg=self.angle_deg)
         ls = LSystem(spec, iterations=self.iterations)
         ls.expand()
-        return ls.interpret()
+        return ls.interpret(dtype=self.dtype)
+
+    def _generate_lsystem_closed_form(self) -> np.ndarray:
+        """
+        Krzywa dla reguly F -> +F--F+ bez rozwijania napisu.
+
+        Po k+1 iteracjach napis to "+" S_k "--" S_k "+", a S_k nie zmienia kierunku,
+        wiec krzywa to kopia obrocona o -kat i doklejona kopia obrocona o +kat.
+
+        Returns:
+            Tablica punktow (x, y) o ksztalcie (2**iterations + 1, 2), tylko do odczytu.
+        """
+        key = (self.iterations, self.angle_deg, np.dtype(self.dtype).str)
+        cached = _closed_form_cache.get(key)
+        if cached is not None:
+            return cached
+
+        pts = next(itertools.islice(_levy_doublings(self.angle_deg), self.iterations, None))
+        pts = (pts * (1.0 / (2 ** (self.iterations / 2)))).astype(self.dtype)
+        pts.flags.writeable = False
+        _closed_form_cache[key] = pts
+        return pts
+
+    def generate_range(self, iter_start: int, iter_stop: int) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        Kolejne iteracje L-systemu od iter_start do iter_stop (wlacznie).
+
+        Kazda iteracja powstaje z poprzedniej, wiec podstawienia F -> regula
+        wykonywane sa tylko raz dla calego zakresu.
+
+        Returns:
+            Generator par (iteracja, tablica punktow (N, 2)); tablice moga byc tylko do odczytu.
+        """
+        rules = self.lsystem_rules or {"F": "+F--F+"}
+        if rules == {"F": "+F--F+"}:
+            for it, pts in enumerate(_levy_doublings(self.angle_deg)):
+                if it >= iter_start:
+                    yield it, (pts * (1.0 / (2 ** (it / 2)))).astype(self.dtype)
+                if it >= iter_stop:
+                    return
+
+        spec = LSystemSpec(axiom="F", rules=rules, angle_deg=self.angle_deg)
+        s = spec.axiom.encode("utf-8")
+        for it in range(iter_stop + 1):
+            if it >= iter_start:
+                ls = LSystem(spec, iterations=it)
+                ls._expanded, ls.expanded_bytes = s.decode("utf-8"), s
+                yield it, ls.interpret(dtype=self.dtype)
+            if it < iter_stop:  # bez rozwijania iteracji, ktora nie zostanie uzyta
+                s = _expand_bytes(s, rules, 1)
 
     # IFS
-    def _generate_ifs(self) -> list[tuple[float, float]]:
+    def _generate_ifs(self) -> np.ndarray:
         """
         Probkowanie IFS klasycznej krzywej Levy'ego C.
 
         Returns:
-            Lista punktow (x, y).
+            Tablica punktow o ksztalcie (n_points, 2).
         """
-        theta = np.deg2rad(45.0)
-        s = 1.0 / np.sqrt(2.0)
+        theta = math.radians(45.0)
+        s = _INV_SQRT2
         R1 = s * rot2d(+theta)
         R2 = s * rot2d(-theta)
         b1 = np.array([0.0, 0.0])
         b2 = np.array([0.5, 0.5])
-        ifs = IFS
+        ifs = IFS([Affine2D(R1, b1), Affine2D(R2, b2)], probs=[0.5, 0.5])
+        return ifs.sample_batched(n_points=self.n_points, seed=self.seed, dtype=self.dtype)
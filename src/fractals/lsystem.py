@@ -1,6 +1,10 @@
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass
+import functools
 import math
+import weakref
+import numpy as np
 
 
 @dataclass
@@ -10,50 +14,190 @@ class LSystemSpec:
     angle_deg: float = 45.0
 
 
+def _expand_bytes(axiom: bytes, rules: dict[str, str], iterations: int) -> bytes:
+    """Rozwin L-system na bajtach UTF-8 (tablica zamian indeksowana kodem znaku)."""
+    rules = {ch: repl for ch, repl in rules.items() if len(ch) == 1}  # jak rules.get(ch, ch)
+    s = axiom
+    if len(rules) == 1:  # jedna regula: split/join dzialaja w C
+        ((ch, repl),) = rules.items()
+        key, rep = ch.encode("utf-8"), repl.encode("utf-8")
+        for _ in range(iterations):
+            s = rep.join(s.split(key))
+        return s
+
+    if not all(ch.isascii() for ch in rules):  # symbol wielobajtowy - podstawienia na str
+        text = s.decode("utf-8")
+        for _ in range(iterations):
+            text = "".join([rules.get(ch, ch) for ch in text])
+        return text.encode("utf-8")
+
+    table = [bytes((c,)) for c in range(256)]
+    for ch, repl in rules.items():
+        table[ord(ch)] = repl.encode("utf-8")
+    for _ in range(iterations):
+        s = b"".join([table[c] for c in s])
+    return s
+
+
+@functools.lru_cache(maxsize=8)
+def _expand_cached(axiom: str, rules_key: tuple[tuple[str, str], ...], iterations: int) -> bytes:
+    """Rozwiniecie L-systemu zapamietane dla (aksjomat, reguly, iteracje)."""
+    return _expand_bytes(axiom.encode("utf-8"), dict(rules_key), iterations)
+
+
+# symbole bez znaczenia dla zolwia (np. zmienne X, Y) - usuwane przed petla
+_NON_TURTLE = bytes(c for c in range(256) if c not in b"FGf+-[]")
+
+# wyniki interpret() trzymane tylko dopoki ktos ich uzywa
+_interpret_cache: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+def _heading_steps(angle: float) -> int | None:
+    """Liczba roznych kierunkow zolwia, gdy kat dzieli 2*pi (8 dla 45°); inaczej None."""
+    if angle == 0.0:
+        return None
+    n = round(2.0 * math.pi / abs(angle))
+    return n if n > 0 and abs(n * abs(angle) - 2.0 * math.pi) < 1e-9 else None
+
+
+class _Directions(dict):
+    """Slownik h -> (dx, dy) dla calkowitego licznika obrotow h, uzupelniany leniwie.
+
+    Kazdy kierunek liczony jest raz (cos/sin), kolejne kroki to tylko odczyt ze slownika.
+    Gdy kat dzieli 2*pi, h i h+n daja identyczne wartosci (bez dryfu floatow).
+    """
+
+    def __init__(self, angle: float, step: float, heading: float = 0.0):
+        super().__init__()
+        self.angle, self.step, self.heading = angle, step, heading
+        self.n = _heading_steps(angle)
+
+    def __missing__(self, h: int) -> tuple[float, float]:
+        a = self.heading + (h % self.n if self.n else h) * self.angle
+        d = self[h] = (self.step * math.cos(a), self.step * math.sin(a))
+        return d
+
+
+def _walk_unbranched(
+    instructions: bytes,
+    angle: float,
+    step: float,
+    start: tuple[float, float] = (0.0, 0.0),
+    heading: float = 0.0,
+    dtype: np.dtype = np.float64,
+) -> np.ndarray:
+    """Wektorowy zolw dla instrukcji bez '[' / ']': kierunki i pozycje z sum prefiksowych."""
+    codes = np.frombuffer(instructions, dtype=np.uint8)
+    turn = np.zeros(codes.size, dtype=np.int64)
+    turn[codes == ord("+")] = -1  # obrot w prawo
+    turn[codes == ord("-")] = 1  # obrot w lewo
+    draw = (codes == ord("F")) | (codes == ord("G"))
+    move = draw | (codes == ord("f"))
+
+    h = np.cumsum(turn)[move]  # calkowity licznik obrotow przed kazdym ruchem
+    n = _heading_steps(angle)
+    if n is not None:  # tablica n kierunkow zamiast cos/sin dla kazdego ruchu
+        k = h % n
+        dirs = heading + angle * np.arange(n)
+        dx, dy = (step * np.cos(dirs))[k], (step * np.sin(dirs))[k]
+    else:
+        dx, dy = step * np.cos(heading + angle * h), step * np.sin(heading + angle * h)
+    xs = start[0] + np.cumsum(dx)
+    ys = start[1] + np.cumsum(dy)
+    keep = draw[move]  # 'f' przesuwa zolwia, ale nie dodaje punktu
+
+    pts = np.empty((int(keep.sum()) + 1, 2), dtype=dtype)  # sumy liczone w float64
+    pts[0] = start
+    pts[1:, 0] = xs[keep]
+    pts[1:, 1] = ys[keep]
+    return pts
+
+
 class LSystem:
     """Ogolny L-system 2D."""
 
     def __init__(self, spec: LSystemSpec, iterations: int = 12):
         self.spec = spec
         self.iterations = iterations
-        self.expanded: str | None = None
+        self._expanded: str | None = None
+        self.expanded_bytes: bytes | None = None  # self.expanded w UTF-8
+        self._key: tuple | None = None  # klucz cache dla wyniku expand()
+
+    @property
+    def expanded(self) -> str | None:
+        return self._expanded
+
+    @expanded.setter
+    def expanded(self, value: str | None) -> None:
+        # reczne przypisanie: bajty liczone od nowa z napisu, wynik poza cache interpret()
+        self._expanded = value
+        self.expanded_bytes = None if value is None else value.encode("utf-8")
+        self._key = None
 
     def expand(self) -> str:
         """Zwraca instrukcje po N iteracjach."""
-        s = self.spec.axiom
-        for _ in range(self.iterations):
-            s = "".join(self.spec.rules.get(ch, ch) for ch in s)
-        self.expanded = s
-        return s
+        rules_key = tuple(sorted(self.spec.rules.items()))
+        self.expanded_bytes = _expand_cached(self.spec.axiom, rules_key, self.iterations)
+        self._expanded = self.expanded_bytes.decode("utf-8")
+        self._key = (self.spec.axiom, rules_key, self.iterations)
+        return self._expanded
+
+    def interpret(self, step: float | None = None, dtype: np.dtype = np.float32) -> np.ndarray:
+        """Konwertuje instrukcje na tablice punktow (x, y) o ksztalcie (N, 2) i typie dtype.
 
-    def interpret(self, step: float | None = None) -> list[tuple[float, float]]:
-        """Konwertuje instrukcje na punkty (x, y)."""
+        Wynik dla instrukcji z expand() jest wspoldzielony miedzy wywolaniami (tylko do odczytu).
+        """
         if self.expanded is None:
             self.expand()
+        if self._key is None or self.expanded_bytes is None:
+            return self._interpret(step, dtype)
+
+        key = (self._key, step, self.spec.angle_deg, np.dtype(dtype).str)
+        pts = _interpret_cache.get(key)
+        if pts is None:
+            pts = self._interpret(step, dtype)
+            pts.flags.writeable = False
+            _interpret_cache[key] = pts
+        return pts
+
+    def _interpret(self, step: float | None, dtype: np.dtype) -> np.ndarray:
         instructions = self.expanded
         angle = math.radians(self.spec.angle_deg)
         if step is None:
             step = 1.0 / (2 ** (self.iterations / 2))
 
-        x, y, heading = 0.0, 0.0, 0.0
-        pts = [(x, y)]
-        stack: list[tuple[float, float, float]] = []
+        raw = self.expanded_bytes
+        if raw is None:
+            raw = instructions.encode("utf-8")
+        if "[" not in instructions and "]" not in instructions:
+            return _walk_unbranched(raw, angle, step, dtype=dtype)
+
+        # petla widzi tylko symbole zolwia; filtr dziala w C
+        instructions = raw.translate(None, _NON_TURTLE).decode("ascii")
+        direction = _Directions(angle, step)
+        x, y, h = 0.0, 0.0, 0  # h: liczba obrotow w lewo minus w prawo
+        xs, ys = array("d", [x]), array("d", [y])  # bufory double zamiast listy krotek
+        stack: list[tuple[float, float, int]] = []
 
         for ch in instructions:
             if ch in ("F", "G"):  # rysuj do przodu
-                x += step * math.cos(heading)
-                y += step * math.sin(heading)
-                pts.append((x, y))
+                dx, dy = direction[h]
+                x += dx
+                y += dy
+                xs.append(x)
+                ys.append(y)
             elif ch == "f":  # ruch bez rysowania
-                x += step * math.cos(heading)
-                y += step * math.sin(heading)
+                dx, dy = direction[h]
+                x += dx
+                y += dy
             elif ch == "+":  # obrot w prawo
-                heading -= angle
+                h -= 1
             elif ch == "-":  # obrot w lewo
-                heading += angle
+                h += 1
             elif ch == "[":  # zapisz stan
-                stack.append((x, y, heading))
+                stack.append((x, y, h))
             elif ch == "]":  # przywroc stan
-                x, y, heading = stack.pop()
-                pts.append((x, y))
-        return pts
+                x, y, h = stack.pop()
+                xs.append(x)
+                ys.append(y)
+        return np.column_stack((np.frombuffer(xs), np.frombuffer(ys))).astype(dtype, copy=False)
@@ -1,4 +1,6 @@
 from __future__ import annotations
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
 from dataclasses import dataclass
@@ -17,19 +19,64 @@ class BoxCountResult:
 DefPoints = Iterable[tuple[float, float]]
 
 
-def _occupied_boxes(points: DefPoints, delta: float) -> set[tuple[int, int]]:
-    """Pomocnicza funkcja do lieczenia komorek: zwroc zbior zajetych komorek."""
-    pts = np.asarray(list(points), dtype=float)
-    x, y = pts[:, 0], pts[:, 1]
-    xmin, ymin = x.min(), y.min()
-    ix = np.floor((x - xmin) / delta).astype(np.int64)
-    iy = np.floor((y - ymin) / delta).astype(np.int64)
-    return set(zip(ix.tolist(), iy.tolist()))
+def _as_point_array(points: DefPoints) -> np.ndarray:
+    """Punkty jako ciagla tablica (N, 2); ndarray nie przechodzi przez list().
+
+    Tablice float32/float64 zachowuja swoj typ, pozostale sa rzutowane na float64.
+    """
+    pts = np.ascontiguousarray(points if isinstance(points, np.ndarray) else list(points))
+    return pts if pts.dtype.kind == "f" else pts.astype(np.float64)
+
+
+def _cell_codes(shifted: np.ndarray, delta: float) -> np.ndarray:
+    """Kody komorek dla punktow przesunietych do (0, 0).
+
+    Komorka (ix, iy) jest kodowana jako jeden uint64: ix w gornych, iy w dolnych 32 bitach.
+    """
+    ix = np.floor(shifted[:, 0] / delta).astype(np.int64)
+    iy = np.floor(shifted[:, 1] / delta).astype(np.int64)
+    return (ix.astype(np.uint64) << np.uint64(32)) | (iy.astype(np.uint64) & np.uint64(0xFFFFFFFF))
+
+
+def _grid_histogram(x: np.ndarray, y: np.ndarray, bins, bounds) -> np.ndarray:
+    """Liczba punktow w kazdej komorce regularnej siatki (jedno wywolanie C, bez sortowania)."""
+    H, _, _ = np.histogram2d(x, y, bins=bins, range=bounds)
+    return H
+
+
+def _count_cells(shifted: np.ndarray, delta: float) -> int:
+    """Liczba zajetych komorek dla punktow przesunietych do (0, 0)."""
+    nx = int(shifted[:, 0].max() // delta) + 1
+    ny = int(shifted[:, 1].max() // delta) + 1
+    if nx * ny < shifted.shape[0]:  # siatka mniejsza niz zbior punktow: gesty histogram
+        H = _grid_histogram(
+            shifted[:, 0], shifted[:, 1], [nx, ny], [[0.0, nx * delta], [0.0, ny * delta]]
+        )
+        return int(np.count_nonzero(H))
+    return int(np.unique(_cell_codes(shifted, delta)).size)
 
 
 def box_count(points: DefPoints, delta: float) -> int:
     """Policz liczbe zajetych komorek dla danego delta."""
-    return len(_occupied_boxes(points, delta))
+    pts = _as_point_array(points)
+    return _count_cells(pts - pts.min(axis=0), delta)
+
+
+def _line_fit(x: np.ndarray, y: np.ndarray) -> tuple[float, float, float]:
+    """Prosta y = slope*x + intercept metoda najmniejszych kwadratow (wzory zamkniete).
+
+    Zwraca (slope, intercept, r), gdzie r = sqrt(R^2).
+    """
+    n = x.size
+    sx, sy = x.sum(), y.sum()
+    sxx, sxy = (x * x).sum(), (x * y).sum()
+    slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+    intercept = (sy - slope * sx) / n
+
+    ss_res = np.sum((y - (slope * x + intercept)) ** 2)
+    ss_tot = np.sum((y - y.mean()) ** 2)
+    r = float(np.sqrt(max(0.0, 1.0 - ss_res / ss_tot))) if ss_tot > 0 else 1.0
+    return float(slope), float(intercept), r
 
 
 def estimate_box_dimension(
@@ -39,18 +86,17 @@ def estimate_box_dimension(
 ) -> tuple[plt.Figure, BoxCountResult]:
     """Estymacja wymiaru komorek: dopasuj prosta do log N_delta, a log(1/delta)."""
     deltas = np.asarray(sorted(deltas), dtype=float)
-    counts = np.array([box_count(points, d) for d in deltas], dtype=float)
+    pts = _as_point_array(points)
+    shifted = pts - pts.min(axis=0)  # konwersja i przesuniecie raz dla wszystkich delta
+    # delty sa niezalezne; sortowanie i histogram w NumPy zwalniaja GIL
+    workers = max(1, min(len(deltas), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        counts = np.array(list(ex.map(lambda d: _count_cells(shifted, d), deltas)), dtype=float)
 
     x = np.log(1.0 / deltas)
     y = np.log(counts)
-    A = np.vstack([x, np.ones_like(x)]).T
-    slope, intercept = np.linalg.lstsq(A, y, rcond=None)[0]
-
-    # estymuj prosta w regresji
+    slope, intercept, r_value = _line_fit(x, y)  # estymuj prosta w regresji
     y_hat = slope * x + intercept
-    ss_res = np.sum((y - y_hat) ** 2)
-    ss_tot = np.sum((y - y.mean()) ** 2)
-    r_value = float(np.sqrt(max(0.0, 1.0 - ss_res / ss_tot))) if ss_tot > 0 else 1.0
 
     # wykres
     fig, ax = plt.subplots(figsize=(6.0, 4.5))
@@ -104,29 +150,51 @@ def estimate_correlation_dimension(
     max_pairs: int = 100_000,
     seed: int = 0,
     title_prefix: str = "Correlation dimension",
+    method: str = "sample",
 ) -> tuple[plt.Figure, CorrelationDimResult]:
-    """Wymiar korelacyjny (Grassberger-Procaccia): nachylenie log C(r), a log r."""
-    rng = np.random.default_rng(seed)
+    """Wymiar korelacyjny (Grassberger-Procaccia): nachylenie log C(r), a log r.
+
+    method: "sample" (domyslnie) - losowa probka `max_pairs` par, "kdtree" - dokladne C(r)
+    ze zliczania par w drzewie KD (wymaga scipy), "auto" - kdtree, gdy scipy jest dostepne.
+    `max_pairs` i `seed` dzialaja tylko dla "sample". "kdtree" jest wyraznie wolniejsze
+    dla duzych zbiorow (dla 50k punktow rzad sekund zamiast ulamka sekundy).
+    """
+    if method not in ("auto", "kdtree", "sample"):
+        raise ValueError(f"Unknown method: {method!r}")
     P = _normalize_to_unit(points)
     n = len(P)
     if n < 2:
         raise ValueError("Need at least 2 points")
-
-    # probkowanie par dla szybkosci
-    num_pairs = min(max_pairs, n * (n - 1) // 2)
-    i_idx = rng.integers(0, n, size=num_pairs)
-    j_idx = rng.integers(0, n, size=num_pairs)
-    mask = i_idx != j_idx
-    i_idx, j_idx = i_idx[mask], j_idx[mask]
-    d = np.linalg.norm(P[i_idx] - P[j_idx], axis=1)
-
     radii = np.asarray(sorted(radii), dtype=float)
-    C = np.array([(d <= r).mean() for r in radii], dtype=float)
+
+    cKDTree = None
+    if method != "sample":
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            if method == "kdtree":
+                raise
+
+    if cKDTree is not None:
+        tree = cKDTree(P)
+        # pary uporzadkowane z parami (i, i); odejmij n i podziel przez n(n-1)
+        counts = tree.count_neighbors(tree, radii).astype(float) - n
+        C = counts / (n * (n - 1))
+    else:
+        # probkowanie par dla szybkosci
+        rng = np.random.default_rng(seed)
+        num_pairs = min(max_pairs, n * (n - 1) // 2)
+        i_idx = rng.integers(0, n, size=num_pairs)
+        j_idx = rng.integers(0, n, size=num_pairs)
+        mask = i_idx != j_idx
+        i_idx, j_idx = i_idx[mask], j_idx[mask]
+        d = np.linalg.norm(P[i_idx] - P[j_idx], axis=1)
+        d.sort()
+        C = np.searchsorted(d, radii, side="right").astype(float) / d.size  # odsetek d <= r
 
     x = np.log(radii)
     y = np.log(np.clip(C, 1e-12, 1.0))
-    A = np.vstack([x, np.ones_like(x)]).T
-    slope, intercept = np.linalg.lstsq(A, y, rcond=None)[0]
+    slope, intercept, _ = _line_fit(x, y)
 
     fig, ax = plt.subplots(figsize=(6, 4.5))
     ax.plot(x, y, "o", label="data")
@@ -161,7 +229,7 @@ def lacunarity_gliding_box(
     for delta in deltas:
         # liczba pudelek na os ~ 1/delta
         nbin = max(1, int(np.round(1.0 / delta)))
-        H, _, _ = np.histogram2d(X, Y, bins=nbin, range=[[0, 1], [0, 1]])
+        H = _grid_histogram(X, Y, nbin, [[0, 1], [0, 1]])
         m = H.ravel()
         mu = m.mean()
         var = m.var()
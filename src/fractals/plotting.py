@@ -1,36 +1,86 @@
+"""Wykresy krzywej Levy'ego C.
+
+Funkcje przyjmuja punkty jako tablice (N, 2), jak zwracaja generatory, lub liste krotek (x, y).
+Wspolrzedne trafiaja do matplotlib jako kolumny tablicy, bez rozpakowywania zip(*points).
+"""
 from __future__ import annotations
+from array import array
+import matplotlib as mpl
 import matplotlib.pyplot as plt
+import numpy as np
 from typing import Iterable
 from .levy_c import LevyCCurve
+from .lsystem import _Directions, _walk_unbranched
 import math
 
 __all__ = ["plot_polyline", "plot_scatter", "plot_iterations_grid", "plot_ifs_progression", "lsystem_interpret_turtle"]
 
 
+# miniatury siatki iteracji: agresywne upraszczanie sciezek (stratne przy duzym powiekszeniu)
+_GRID_SIMPLIFY = {"path.simplify": True, "path.simplify_threshold": 1.0}
+
+PointsLike = np.ndarray | Iterable[tuple[float, float]]
+
+
+def _xy(points: PointsLike) -> tuple[np.ndarray, np.ndarray]:
+    """Wspolrzedne x, y jako widoki kolumn tablicy (N, 2) zamiast zip(*points).
+
+    Tablica (N, 2) nie jest kopiowana; inne iterowalne (np. generatory) przechodza przez list().
+    """
+    if isinstance(points, np.ndarray) and points.ndim == 2 and points.shape[1] == 2:
+        pts = points
+    else:
+        pts = np.asarray(points if isinstance(points, (list, tuple)) else list(points))
+    if pts.dtype.kind != "f":  # float32 zostaje bez kopii
+        pts = pts.astype(float)
+    return pts[:, 0], pts[:, 1]
+
+
+def _plot_dots(ax, xs, ys, s: float):
+    """Jednakowe punkty jako Line2D z markerem ',' - szybsze niz scatter (PathCollection)."""
+    ax.plot(xs, ys, linestyle="None", marker=",", markersize=max(1, s * 5), rasterized=True)
+
+
+def _plot_density(ax, xs, ys, bins: int = 600):
+    """Gesty zbior punktow jako raster log(1 + liczba punktow w komorce) - koszt O(pikseli)."""
+    H, xe, ye = np.histogram2d(xs, ys, bins=bins)
+    img = np.ma.masked_equal(np.log1p(H).T, 0.0)  # puste komorki zostaja tlem
+    ax.imshow(
+        img,
+        origin="lower",
+        extent=[xe[0], xe[-1], ye[0], ye[-1]],
+        cmap="magma",
+        interpolation="nearest",
+    )
+
+
 def _clean_axes(ax):
     ax.set_aspect("equal", adjustable="box")  # proporcje 1:1
     ax.axis("off")
 
 
-def plot_polyline(points: Iterable[tuple[float, float]], linewidth: float = 0.8, title: str = ""):
-    """Wizualizuj krzywa z listy punktow."""
-    xs, ys = zip(*points)
+def plot_polyline(points: PointsLike, linewidth: float = 0.8, title: str = ""):
+    """Wizualizuj krzywa z tablicy (N, 2) lub listy punktow."""
+    xs, ys = _xy(points)
     fig, ax = plt.subplots(figsize=(6, 6))
     ax.plot(xs, ys, linewidth=linewidth)
     ax.set_title(title)
     _clean_axes(ax)
-    fig.tight_layout()
     return fig
 
 
-def plot_scatter(points: Iterable[tuple[float, float]], s: float = 0.2, title: str = ""):
+def plot_scatter(
+    points: PointsLike, s: float = 0.2, title: str = "", _fast: bool = False
+):
     """Wykres dla punktow."""
-    xs, ys = zip(*points)
+    xs, ys = _xy(points)
     fig, ax = plt.subplots(figsize=(6, 6))
-    ax.scatter(xs, ys, s=s)
+    if _fast:
+        _plot_dots(ax, xs, ys, s)
+    else:
+        ax.scatter(xs, ys, s=s)
     ax.set_title(title)
     _clean_axes(ax)
-    fig.tight_layout()
     return fig
 
 
@@ -42,7 +92,11 @@ def plot_iterations_grid(
     cell_size: float = 3.5,
     linewidth: float = 0.8,
 ):
-    """Wizualizacja L-systemu po iteracjach."""
+    """Wizualizacja L-systemu po iteracjach.
+
+    Krzywe sa upraszczane przy rysowaniu (path.simplify_threshold=1.0) - wystarczajace
+    dla miniatur, ale stratne przy duzym powiekszeniu.
+    """
     total = max(0, iter_stop - iter_start + 1)
     if total == 0:
         raise ValueError("iter_stop must be >= iter_start")
@@ -50,18 +104,29 @@ def plot_iterations_grid(
     cols = min(total, max(1, max_per_row))
     rows = (total + cols - 1) // cols
 
-    fig, axes = plt.subplots(rows, cols, figsize=(cell_size * cols, cell_size * rows))
+    fig, axes = plt.subplots(
+        rows, cols, figsize=(cell_size * cols, cell_size * rows), layout="constrained"
+    )
     if rows == 1 and cols == 1:
         axes_list = [axes]
     else:
         axes_list = axes.ravel().tolist()
 
-    for idx, it in enumerate(range(iter_start, iter_stop + 1)):
-        lc = LevyCCurve(method="lsystem", iterations=it, angle_deg=angle_deg)  # generuj dla danej iteracji
-        pts = lc.generate()
-        xs, ys = zip(*pts)
+    lc = LevyCCurve(method="lsystem", iterations=iter_stop, angle_deg=angle_deg)
+    if angle_deg == 45.0:
+        # dla 45° wierzcholki iteracji k to co 2**(stop-k)-ty punkt iteracji stop
+        pts_stop = lc.generate()
+        its = range(iter_start, iter_stop + 1)
+        panels = ((it, pts_stop[:: 2 ** (iter_stop - it)]) for it in its)
+    else:
+        panels = lc.generate_range(iter_start, iter_stop)  # kazda iteracja z poprzedniej
+
+    for idx, (it, pts) in enumerate(panels):
+        xs, ys = _xy(pts)
         ax = axes_list[idx]
-        ax.plot(xs, ys, linewidth=linewidth)
+        # sciezka Line2D powstaje w ax.plot, wiec przejmuje uproszczenie z kontekstu
+        with mpl.rc_context(_GRID_SIMPLIFY):
+            ax.plot(xs, ys, linewidth=linewidth)
         ax.set_title(f"it={it}")
         _clean_axes(ax)
 
@@ -69,7 +134,6 @@ def plot_iterations_grid(
         axes_list[j].axis("off")
 
     fig.suptitle(f"Levy C-curve iterations (angle={angle_deg}°)")
-    fig.tight_layout()
     return fig
 
 
@@ -79,8 +143,15 @@ def plot_ifs_progression(
     s: float = 0.2,
     cell_size: float = 3.5,
     title_prefix: str = "Levy C-curve (IFS)",
+    use_raster: bool | str = "auto",
+    seed: int | None = 1337,
 ):
-    """Zwizualizuj IFS dla rosnącej liczby punktow."""
+    """Zwizualizuj IFS dla rosnącej liczby punktow.
+
+    use_raster: True - histogram 2D zamiast punktow, False - punkty,
+    "auto" - histogram dla n > 20 000.
+    Probkowanie odbywa sie raz dla max(point_counts); panele pokazuja prefiksy tej probki.
+    """
     counts = list(point_counts)
     total = len(counts)
     if total == 0:
@@ -89,15 +160,22 @@ def plot_ifs_progression(
     cols = min(total, max(1, max_per_row))
     rows = (total + cols - 1) // cols
 
-    fig, axes = plt.subplots(rows, cols, figsize=(cell_size * cols, cell_size * rows))
+    fig, axes = plt.subplots(
+        rows, cols, figsize=(cell_size * cols, cell_size * rows), layout="constrained"
+    )
     axes_list = [axes] if rows == 1 and cols == 1 else axes.ravel().tolist()
 
+    # przy stalym seedzie probka n punktow to prefiks probki max(counts)
+    lc = LevyCCurve(method="ifs", n_points=int(max(counts)), seed=seed)  # probkuj IFS
+    all_pts = lc.generate()
+
     for idx, n in enumerate(counts):
-        lc = LevyCCurve(method="ifs", n_points=int(n))  # probkuj IFS
-        pts = lc.generate()
-        xs, ys = zip(*pts)
+        xs, ys = _xy(all_pts[: int(n)])
         ax = axes_list[idx]
-        ax.scatter(xs, ys, s=s)
+        if use_raster is True or (use_raster == "auto" and n > 20_000):
+            _plot_density(ax, xs, ys)
+        else:
+            _plot_dots(ax, xs, ys, s)
         ax.set_title(f"{title_prefix} — n={n:,}")
         ax.set_aspect("equal")
         ax.axis("off")
@@ -105,7 +183,6 @@ def plot_ifs_progression(
     for j in range(total, len(axes_list)):
         axes_list[j].axis("off")
 
-    fig.tight_layout()
     return fig
 
 
@@ -115,30 +192,41 @@ def lsystem_interpret_turtle(
     step: float = 1.0,
     start: tuple[float, float] = (0.0, 0.0),
     heading_deg: float = 0.0,
-):
-    """Zwraca liste punktow (x, y)."""
+) -> np.ndarray:
+    """Zwraca tablice punktow (x, y) o ksztalcie (N, 2)."""
     x, y = start
     heading = math.radians(heading_deg)
     ang = math.radians(angle_deg)
-    pts = [(x, y)]
+    if "[" not in instructions and "]" not in instructions:  # bez rozgalezien: sumy prefiksowe
+        raw = instructions.encode("utf-8")  # bajty wielobajtowe nigdy nie trafia w 'F', '+', ...
+        return _walk_unbranched(raw, ang, step, start=(x, y), heading=heading)
+
+    # h: calkowity licznik obrotow; (dx, dy) dla kazdego h liczone raz
+    direction = _Directions(ang, step, heading)
+    h = 0
+    xs, ys = array("d", [x]), array("d", [y])  # bufory double zamiast listy krotek
     stack = []
 
     for ch in instructions:
         if ch in ("F", "G"):  # rysuj do przodu
-            x += step * math.cos(heading)
-            y += step * math.sin(heading)
-            pts.append((x, y))
+            dx, dy = direction[h]
+            x += dx
+            y += dy
+            xs.append(x)
+            ys.append(y)
         elif ch == "f":  # ruch bez rysowania
-            x += step * math.cos(heading)
-            y += step * math.sin(heading)
+            dx, dy = direction[h]
+            x += dx
+            y += dy
         elif ch == "+":  # obrot w prawo
-            heading -= ang
+            h -= 1
         elif ch == "-":  # obrot w lewo
-            heading += ang
+            h += 1
         elif ch == "[":  # zapisz stan
-            stack.append((x, y, heading))
+            stack.append((x, y, h))
         elif ch == "]" and stack:  # przywroc stan
-            x, y, heading = stack.pop()
-            pts.append((x, y))
+            x, y, h = stack.pop()
+            xs.append(x)
+            ys.append(y)
 
-    return pts
+    return np.column_stack((np.frombuffer(xs), np.frombuffer(ys)))
@@ -1,22 +1,42 @@
 from __future__ import annotations
+import functools
+import math
 import numpy as np
 
 
-__all__ = ["rot2d", "normalize_probs", "seeded_rng"]
+__all__ = ["rot2d", "normalize_probs", "seeded_rng", "as_list_of_tuples"]
+
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)  # skala map krzywej Levy'ego
+
+
+@functools.lru_cache(maxsize=256)
+def _rot2d_cached(theta_rad: float) -> np.ndarray:
+    c, s = math.cos(theta_rad), math.sin(theta_rad)
+    R = np.array([[c, -s], [s, c]], dtype=float)
+    R.flags.writeable = False
+    return R
 
 
 def rot2d(theta_rad: float) -> np.ndarray:
-    c, s = np.cos(theta_rad), np.sin(theta_rad)
-    return np.array([[c, -s], [s, c]], dtype=float)
+    """Macierz obrotu 2x2; wspoldzielona miedzy wywolaniami, wiec tylko do odczytu."""
+    return _rot2d_cached(float(theta_rad))
 
 
 def normalize_probs(p):
-    p = np.asarray(p, dtype=float)
+    if not (isinstance(p, np.ndarray) and p.dtype == np.float64):  # jedna konwersja
+        p = np.asarray(p, dtype=float)
     s = p.sum()
     if s <= 0:
         raise ValueError("Probabilities must sum to > 0")
-    return p / s
+    if abs(s - 1.0) < 1e-12:  # juz znormalizowane - bez kopii
+        return p
+    return p * (1.0 / s)
 
 
 def seeded_rng(seed: int | None):
     return np.random.default_rng(seed)
+
+
+def as_list_of_tuples(points) -> list[tuple[float, float]]:
+    """Tablica punktow (N, 2) jako lista krotek (x, y) - zgodnosc ze starym API."""
+    return [(x, y) for x, y in np.asarray(points, dtype=float).tolist()]
@@ -1,19 +1,51 @@
 from __future__ import annotations
+import math
 import numpy as np
-from .utils import rot2d
+from .utils import _INV_SQRT2, rot2d, seeded_rng
 from .ifs import IFS, Affine2D
 
+__all__ = ["levy_ifs_generalized", "levy_lsystem_stochastic", "lsystem_expand_stochastic"]
+
+try:
+    from ._lsystem_kernels import expand_stochastic as _expand_stochastic_jit
+except ImportError:  # numba jest opcjonalna - zostaje petla Pythona
+    _expand_stochastic_jit = None
+
+try:
+    from ._ifs_kernels import levy_two_maps as _levy_two_maps_jit
+except ImportError:  # numba jest opcjonalna - probkowanie przez IFS.sample
+    _levy_two_maps_jit = None
+
 # Wariant I, uogolniony kat
-def levy_ifs_generalized(angle_deg: float = 45.0) -> IFS:
-    """IFS krzywej typu Levy dla ±angle i skali 1/sqrt(2)."""
-    theta = np.deg2rad(angle_deg)
-    s = 1.0 / np.sqrt(2.0)
+def levy_ifs_generalized(
+    angle_deg: float = 45.0,
+    fast: bool = False,
+    n_points: int = 50_000,
+    seed: int | None = 1337,
+    dtype: np.dtype = np.float32,
+) -> IFS | np.ndarray:
+    """IFS krzywej typu Levy dla ±angle i skali 1/sqrt(2).
+
+    Przy fast=True zwraca od razu punkty (n_points, 2) z kernela Numba dla dwoch map,
+    bez budowania IFS (bez numby: IFS.sample z tymi samymi parametrami).
+    """
+    theta = math.radians(angle_deg)
+    s = _INV_SQRT2
+    if fast and _levy_two_maps_jit is not None:
+        kernel_seed = seeded_rng(seed).integers(0, 2**63, dtype=np.uint64)
+        out = np.empty((n_points, 2), dtype=dtype)
+        return _levy_two_maps_jit(
+            s * math.cos(theta), s * math.sin(theta), kernel_seed, n_points, 100, out
+        )
     R1 = s * rot2d(+theta)
     R2 = s * rot2d(-theta)
     # translacje trzymaja ksztalt w oknie [0,1]^2
     b1 = np.array([0.0, 0.0])
     b2 = np.array([0.5, 0.5])
-    return IFS([Affine2D(R1, b1), Affine2D(R2, b2)], probs=[0.5, 0.5])
+    ifs = IFS([Affine2D(R1, b1), Affine2D(R2, b2)], probs=[0.5, 0.5])
+    if fast:
+        return ifs.sample(n_points=n_points, seed=seed, dtype=dtype)
+    return ifs
 
 
 # Wariant II, stochastyczny wybor zasad dla L-systemu
@@ -32,14 +64,46 @@ def lsystem_expand_stochastic(
     seed: int | None = 0,
 ) -> str:
     """Stochastyczny wybor: kazde 'F' -> wariant z p lub originalny z 1-p."""
+    ra, rb = rule_classic.encode("utf-8"), rule_variant.encode("utf-8")
+    s = axiom.encode("utf-8")
+    if p <= 0.0 or p >= 1.0:  # rng.random() < p ma staly wynik - bez losowania
+        rule = rb if p >= 1.0 else ra
+        for _ in range(iterations):
+            s = rule.join(s.split(b"F"))
+        return s.decode("utf-8")
+
     rng = np.random.default_rng(seed)
-    s = axiom
+    if _expand_stochastic_jit is not None:
+        return _expand_stochastic_numba(rng, axiom, iterations, p, rule_classic, rule_variant)
+    for _ in range(iterations):
+        # fragmenty miedzy kolejnymi 'F' przeplatane wylosowanymi regulami (split/join w C)
+        pieces = s.split(b"F")
+        chosen = [rb if m else ra for m in (rng.random(len(pieces) - 1) < p).tolist()]
+        out = [b""] * (2 * len(pieces) - 1)
+        out[::2] = pieces
+        out[1::2] = chosen
+        s = b"".join(out)
+    return s.decode("utf-8")
+
+
+def _expand_stochastic_numba(
+    rng: np.random.Generator,
+    axiom: str,
+    iterations: int,
+    p: float,
+    rule_classic: str,
+    rule_variant: str,
+) -> str:
+    """Jak lsystem_expand_stochastic, ale kazdy krok to kernel Numba na buforze uint8.
+
+    Losowania dla wszystkich 'F' kroku sa pobierane naraz (ten sam strumien co kolejne
+    rng.random()), wiec wynik jest identyczny jak w petli Pythona.
+    """
+    ra = np.frombuffer(rule_classic.encode("utf-8"), dtype=np.uint8)
+    rb = np.frombuffer(rule_variant.encode("utf-8"), dtype=np.uint8)
+    buf = np.frombuffer(axiom.encode("utf-8"), dtype=np.uint8)
+    f_ord = np.uint8(ord("F"))
     for _ in range(iterations):
-        out = []
-        for ch in s:
-            if ch == "F":
-                out.append(rule_variant if rng.random() < p else rule_classic)
-            else:
-                out.append(ch)
-        s = "".join(out)
-    return s
+        rand_bits = rng.random(int(np.count_nonzero(buf == f_ord))) < p
+        buf = _expand_stochastic_jit(buf, rand_bits, ra, rb, f_ord)
+    return buf.tobytes().decode("utf-8")